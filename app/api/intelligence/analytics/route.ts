@@ -14,7 +14,7 @@ export async function GET(request: NextRequest) {
     const [tasksResult, agentsResult, logsResult] = await Promise.all([
       supabase.from('tasks').select('*'),
       supabase.from('agents').select('*'),
-      supabase.from('task_logs').select('*').order('created_at', { ascending: false }).limit(100)
+      supabase.from('task_logs').select('*').order('created_at', { ascending: false }).order('seq', { ascending: false }).limit(100)
     ])
 
     const tasks = tasksResult.data || []
@@ -0,0 +1,57 @@
+import { NextRequest } from 'next/server'
+import { createClient } from '@/lib/supabase/server'
+import { apiSuccess, apiError, handleApiError } from '@/lib/utils/api-helpers'
+import type { CreateTaskLogBatchRequest } from '@/types'
+
+// Force dynamic rendering (prevent static generation at build time)
+export const dynamic = 'force-dynamic'
+
+const MAX_BATCH_SIZE = 500
+
+export async function POST(
+  request: NextRequest,
+  { params }: { params: { id: string } }
+) {
+  try {
+    const supabase = await createClient()
+    const { id } = await params
+    const body: CreateTaskLogBatchRequest = await request.json()
+
+    if (!Array.isArray(body.entries) || body.entries.length === 0) {
+      return apiError('entries array is required')
+    }
+
+    if (body.entries.length > MAX_BATCH_SIZE) {
+      return apiError(`entries cannot contain more than ${MAX_BATCH_SIZE} logs`)
+    }
+
+    for (const entry of body.entries) {
+      if (!entry.message) {
+        return apiError('message is required')
+      }
+
+      if (!entry.level) {
+        return apiError('level is required')
+      }
+    }
+
+    // Rows inserted together share the same created_at; the database assigns
+    // seq in insertion order, which keeps the batch in order when read back
+    const { data, error } = await supabase
+      .from('task_logs')
+      .insert(body.entries.map((entry) => ({
+        task_id: id,
+        agent_id: entry.agent_id || body.agent_id || null,
+        level: entry.level,
+        message: entry.message,
+        data: entry.data || {}
+      })))
+      .select()
+
+    if (error) throw error
+
+    return apiSuccess(data, 201)
+  } catch (error) {
+    return handleApiError(error)
+  }
+}
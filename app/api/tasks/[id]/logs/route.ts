@@ -19,6 +19,7 @@ export async function GET(
       .select('*')
       .eq('task_id', id)
       .order('created_at', { ascending: true })
+      .order('seq', { ascending: true })
 
     if (error) throw error
 
@@ -6,6 +6,78 @@ import type { PollTaskRequest } from '@/types'
 // Force dynamic rendering (prevent static generation at build time)
 export const dynamic = 'force-dynamic'
 
+// Long polls hold the request for up to MAX_WAIT_MS
+export const maxDuration = 60
+
+// Long-poll limits: agents may ask the server to hold the request open until
+// a task is available. The queue is re-checked after POLL_RECHECK_MIN_MS,
+// doubling up to POLL_RECHECK_MAX_MS so idle agents add little database load.
+const MAX_WAIT_MS = 30000
+const POLL_RECHECK_MIN_MS = 1000
+const POLL_RECHECK_MAX_MS = 5000
+
+type SupabaseClient = Awaited<ReturnType<typeof createClient>>
+
+async function claimNextTask(supabase: SupabaseClient, body: PollTaskRequest) {
+  // Find the highest priority pending task that matches agent capabilities
+  // and has no unmet dependencies
+  const { data: tasks, error: tasksError } = await supabase
+    .from('tasks')
+    .select('*')
+    .eq('status', 'pending')
+    .order('priority', { ascending: false })
+    .order('created_at', { ascending: true })
+
+  if (tasksError) throw tasksError
+
+  // Filter tasks by capabilities and dependencies
+  let assignableTask = null
+
+  for (const task of tasks || []) {
+    // Check if agent has required capabilities
+    const hasCapabilities = task.required_capabilities.length === 0 ||
+      task.required_capabilities.every((cap: string) => body.capabilities.includes(cap))
+
+    if (!hasCapabilities) continue
+
+    // Check if all dependencies are completed
+    if (task.dependencies.length > 0) {
+      const { data: depTasks, error: depError } = await supabase
+        .from('tasks')
+        .select('id, status')
+        .in('id', task.dependencies)
+
+      if (depError) continue
+
+      const allDepsCompleted = depTasks?.every(dep => dep.status === 'completed') ?? false
+      if (!allDepsCompleted) continue
+    }
+
+    assignableTask = task
+    break
+  }
+
+  if (!assignableTask) return null
+
+  // Assign task to agent. Only claim it if it is still pending so that
+  // concurrent long-polling agents cannot both take the same task.
+  const { data: updatedTask, error: updateError } = await supabase
+    .from('tasks')
+    .update({
+      status: 'assigned',
+      assigned_agent_id: body.agent_id,
+      started_at: new Date().toISOString()
+    })
+    .eq('id', assignableTask.id)
+    .eq('status', 'pending')
+    .select()
+    .maybeSingle()
+
+  if (updateError) throw updateError
+
+  return updatedTask
+}
+
 export async function POST(request: NextRequest) {
   try {
     const supabase = await createClient()
@@ -19,63 +91,23 @@ export async function POST(request: NextRequest) {
       return apiError('capabilities array is required')
     }
 
-    // Find the highest priority pending task that matches agent capabilities
-    // and has no unmet dependencies
-    const { data: tasks, error: tasksError } = await supabase
-      .from('tasks')
-      .select('*')
-      .eq('status', 'pending')
-      .order('priority', { ascending: false })
-      .order('created_at', { ascending: true })
-
-    if (tasksError) throw tasksError
+    const waitMs = Math.min(Math.max(Number(body.wait_ms) || 0, 0), MAX_WAIT_MS)
+    const deadline = Date.now() + waitMs
 
-    // Filter tasks by capabilities and dependencies
-    let assignableTask = null
-
-    for (const task of tasks || []) {
-      // Check if agent has required capabilities
-      const hasCapabilities = task.required_capabilities.length === 0 ||
-        task.required_capabilities.every((cap: string) => body.capabilities.includes(cap))
-
-      if (!hasCapabilities) continue
-
-      // Check if all dependencies are completed
-      if (task.dependencies.length > 0) {
-        const { data: depTasks, error: depError } = await supabase
-          .from('tasks')
-          .select('id, status')
-          .in('id', task.dependencies)
-
-        if (depError) continue
-
-        const allDepsCompleted = depTasks?.every(dep => dep.status === 'completed') ?? false
-        if (!allDepsCompleted) continue
-      }
-
-      assignableTask = task
-      break
-    }
+    let task = await claimNextTask(supabase, body)
+    let recheckMs = POLL_RECHECK_MIN_MS
 
-    if (!assignableTask) {
-      return apiSuccess({ task: null })
+    // Hold the connection open until a task shows up, the wait elapses,
+    // or the agent disconnects
+    while (!task && Date.now() < deadline && !request.signal.aborted) {
+      await new Promise(resolve =>
+        setTimeout(resolve, Math.min(recheckMs, deadline - Date.now()))
+      )
+      recheckMs = Math.min(recheckMs * 2, POLL_RECHECK_MAX_MS)
+      task = await claimNextTask(supabase, body)
     }
 
-    // Assign task to agent
-    const { data: updatedTask, error: updateError } = await supabase
-      .from('tasks')
-      .update({
-        status: 'assigned',
-        assigned_agent_id: body.agent_id,
-        started_at: new Date().toISOString()
-      })
-      .eq('id', assignableTask.id)
-      .select()
-      .single()
-
-    if (updateError) throw updateError
-
-    return apiSuccess({ task: updatedTask })
+    return apiSuccess({ task })
   } catch (error) {
     return handleApiError(error)
   }
@@ -47,6 +47,7 @@ async function getTaskDetails(taskId: string) {
     .select('*')
     .eq('task_id', taskId)
     .order('created_at', { ascending: true })
+    .order('seq', { ascending: true })
 
   // Fetch related analyses
   const { data: analyses } = await supabase
@@ -9,15 +9,26 @@ Usage:
     python agent-starter.py --agent-id YOUR_AGENT_ID --api-key YOUR_API_KEY
 
 Requirements:
-    pip install requests anthropic openai
+    pip install "httpx[http2]" anthropic openai
+
+Optional:
+    pip install orjson    # faster JSON encoding/decoding
 """
 
 import argparse
 import json
 import logging
+import queue
+import random
+import threading
 import time
 from typing import Dict, Any, Optional
-import requests
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +37,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Task log messages are batched: the flusher sends up to LOG_BATCH_SIZE
+# entries per request, waiting at most LOG_FLUSH_INTERVAL for a batch to fill
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 0.2
+
+# complete/fail calls are retried on transient gateway errors so a task isn't
+# left assigned on the server (the transport only retries failed connects)
+STATUS_RETRIES = 3
+RETRY_STATUSES = {502, 503, 504}
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS coerces int/None/etc. keys the way the stdlib does
+        option = orjson.OPT_NON_STR_KEYS
+        option |= (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=str
+    ).encode()
+
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
 class ConductorAgent:
     """Base class for Conductor agents"""
 
@@ -35,31 +76,62 @@ class ConductorAgent:
         api_key: str,
         capabilities: list[str],
         base_url: str = "http://localhost:3000",
-        poll_interval: int = 5
+        poll_interval: int = 5,
+        long_poll_timeout: int = 25,
+        heartbeat_interval: int = 30
     ):
         self.agent_id = agent_id
         self.api_key = api_key
         self.capabilities = capabilities
         self.base_url = base_url
         self.poll_interval = poll_interval
+        self.long_poll_timeout = long_poll_timeout
+        self.heartbeat_interval = heartbeat_interval
         self.running = True
 
+        # The poll request never changes, so encode it once
+        self._poll_payload = json_dumps({
+            "agent_id": agent_id,
+            "capabilities": capabilities,
+            "wait_ms": long_poll_timeout * 1000
+        })
+        self._cap_str = ", ".join(capabilities)
+        self._hb_status = "active"
+        self._hb_lock = threading.Lock()
+        self._hb_stop = threading.Event()
+
+        # One HTTP/2 connection carries polls, heartbeats and logs as
+        # multiplexed streams instead of a TCP/TLS handshake per request
+        self.session = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+            ),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
+
+        # Task logs are queued and posted in batches by a background thread
+        self._log_queue: queue.Queue = queue.Queue(maxsize=1024)
+        self._log_thread = threading.Thread(target=self._log_flusher, daemon=True)
+        self._log_thread.start()
+
     def poll_for_task(self) -> Optional[Dict[str, Any]]:
-        """Poll the API for an available task"""
+        """Long-poll the API for an available task"""
         try:
-            response = requests.post(
+            # The server holds the request open for up to wait_ms until a
+            # task is available, so allow some slack on the client timeout
+            response = self.session.post(
                 f"{self.base_url}/api/tasks/poll",
-                json={
-                    "agent_id": self.agent_id,
-                    "capabilities": self.capabilities
-                },
-                headers={"Content-Type": "application/json"}
+                content=self._poll_payload,
+                timeout=self.long_poll_timeout + 5
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 if data.get("success") and data.get("data"):
-                    return data["data"]
+                    return data["data"].get("task")
             return None
 
         except Exception as e:
@@ -69,13 +141,12 @@ class ConductorAgent:
     def send_heartbeat(self, status: str = "active") -> bool:
         """Send heartbeat to indicate agent is alive"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/agents/heartbeat",
-                json={
+                content=json_dumps({
                     "agent_id": self.agent_id,
                     "status": status
-                },
-                headers={"Content-Type": "application/json"}
+                })
             )
             return response.status_code == 200
         except Exception as e:
@@ -83,31 +154,76 @@ class ConductorAgent:
             return False
 
     def log_task_message(self, task_id: str, message: str, level: str = "info", data: Optional[Dict] = None):
-        """Log a message for a task"""
+        """Queue a message for a task; it is sent in the background"""
+        entry = {
+            "agent_id": self.agent_id,
+            "level": level,
+            "message": message,
+            "data": data or {}
+        }
         try:
-            requests.post(
-                f"{self.base_url}/api/tasks/{task_id}/logs",
-                json={
-                    "agent_id": self.agent_id,
-                    "level": level,
-                    "message": message,
-                    "data": data or {}
-                },
-                headers={"Content-Type": "application/json"}
-            )
-        except Exception as e:
-            logger.error(f"Error logging task message: {e}")
+            self._log_queue.put_nowait((task_id, entry))
+        except queue.Full:
+            # Queue is backed up, send this one directly
+            self._send_log_batch([(task_id, entry)])
+
+    def _send_log_batch(self, batch: list[tuple[str, Dict[str, Any]]]):
+        """Send queued log entries, one request per task"""
+        by_task: Dict[str, list[Dict[str, Any]]] = {}
+        for task_id, entry in batch:
+            by_task.setdefault(task_id, []).append(entry)
+
+        for task_id, entries in by_task.items():
+            try:
+                self.session.post(
+                    f"{self.base_url}/api/tasks/{task_id}/logs/batch",
+                    content=json_dumps({
+                        "agent_id": self.agent_id,
+                        "entries": entries
+                    })
+                )
+            except Exception as e:
+                logger.error(f"Error logging task messages: {e}")
+
+    def _log_flusher(self):
+        """Drain the log queue, batching entries that arrive close together"""
+        while True:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while len(batch) < LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._send_log_batch(batch)
+            for _ in batch:
+                self._log_queue.task_done()
+
+    def flush_logs(self):
+        """Block until every queued log message has been sent"""
+        self._log_queue.join()
+
+    def _post_with_retry(self, url: str, content: bytes) -> httpx.Response:
+        """POST, retrying 502/503/504 responses with exponential backoff"""
+        for attempt in range(STATUS_RETRIES + 1):
+            response = self.session.post(url, content=content)
+            if response.status_code not in RETRY_STATUSES or attempt == STATUS_RETRIES:
+                return response
+            time.sleep(0.3 * 2 ** attempt)
 
     def complete_task(self, task_id: str, output_data: Dict[str, Any]) -> bool:
         """Mark task as completed"""
         try:
-            response = requests.post(
+            response = self._post_with_retry(
                 f"{self.base_url}/api/tasks/{task_id}/complete",
-                json={
+                content=json_dumps({
                     "agent_id": self.agent_id,
                     "output_data": output_data
-                },
-                headers={"Content-Type": "application/json"}
+                })
             )
             return response.status_code == 200
         except Exception as e:
@@ -117,13 +233,12 @@ class ConductorAgent:
     def fail_task(self, task_id: str, error_message: str) -> bool:
         """Mark task as failed"""
         try:
-            response = requests.post(
+            response = self._post_with_retry(
                 f"{self.base_url}/api/tasks/{task_id}/fail",
-                json={
+                content=json_dumps({
                     "agent_id": self.agent_id,
                     "error_message": error_message
-                },
-                headers={"Content-Type": "application/json"}
+                })
             )
             return response.status_code == 200
         except Exception as e:
@@ -142,25 +257,42 @@ class ConductorAgent:
         """
         raise NotImplementedError("Subclasses must implement execute_task()")
 
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, capped at poll_interval"""
+        return random.uniform(0, min(self.poll_interval, 0.5 * 2 ** attempt))
+
+    def _set_status(self, status: str):
+        """Set the status reported by the next heartbeat"""
+        with self._hb_lock:
+            self._hb_status = status
+
+    def _heartbeat_loop(self):
+        """Send heartbeats on a fixed wall clock until stopped"""
+        self.send_heartbeat("active")
+        while not self._hb_stop.wait(self.heartbeat_interval):
+            with self._hb_lock:
+                status = self._hb_status
+            self.send_heartbeat(status)
+            logger.debug("Sent heartbeat")
+
     def run(self):
         """Main agent loop"""
         logger.info(f"Agent {self.agent_id} starting...")
-        logger.info(f"Capabilities: {', '.join(self.capabilities)}")
+        logger.info(f"Capabilities: {self._cap_str}")
 
-        heartbeat_counter = 0
+        # Heartbeats run on their own thread so a long poll never delays them
+        heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat_thread.start()
+
+        idle_polls = 0
 
         while self.running:
             try:
-                # Send heartbeat every 6 polls (30 seconds if poll_interval is 5)
-                if heartbeat_counter % 6 == 0:
-                    self.send_heartbeat("active")
-                    logger.debug("Sent heartbeat")
-                heartbeat_counter += 1
-
-                # Poll for task
+                # Long-poll for task
                 task = self.poll_for_task()
 
                 if task:
+                    idle_polls = 0
                     task_id = task["id"]
                     logger.info(f"Received task: {task['title']}")
 
@@ -168,7 +300,7 @@ class ConductorAgent:
 
                     try:
                         # Update heartbeat to busy
-                        self.send_heartbeat("busy")
+                        self._set_status("busy")
 
                         # Execute the task
                         self.log_task_message(task_id, "Starting task execution")
@@ -176,31 +308,38 @@ class ConductorAgent:
 
                         # Complete the task
                         self.log_task_message(task_id, "Task completed successfully")
+                        self.flush_logs()
                         self.complete_task(task_id, output_data)
                         logger.info(f"Task {task_id} completed successfully")
 
                     except Exception as e:
                         logger.error(f"Task execution failed: {e}")
                         self.log_task_message(task_id, f"Task execution failed: {str(e)}", level="error")
+                        self.flush_logs()
                         self.fail_task(task_id, str(e))
 
                     finally:
                         # Reset to active
-                        self.send_heartbeat("active")
+                        self._set_status("active")
                 else:
+                    # Back off only when idle; after a task, poll again immediately
                     logger.debug("No tasks available")
-
-                # Wait before next poll
-                time.sleep(self.poll_interval)
+                    time.sleep(self._backoff_delay(idle_polls))
+                    idle_polls += 1
 
             except KeyboardInterrupt:
                 logger.info("Shutting down agent...")
                 self.running = False
+                self._hb_stop.set()
+                heartbeat_thread.join(timeout=5)
+                self.flush_logs()
                 self.send_heartbeat("offline")
+                self.session.close()
                 break
             except Exception as e:
                 logger.error(f"Error in agent loop: {e}")
-                time.sleep(self.poll_interval)
+                time.sleep(self._backoff_delay(idle_polls))
+                idle_polls += 1
 
 
 class ExampleAgent(ConductorAgent):
@@ -261,7 +400,8 @@ def main():
     parser.add_argument("--agent-id", required=True, help="Agent ID from Conductor")
     parser.add_argument("--api-key", required=True, help="AI API key (Anthropic/OpenAI)")
     parser.add_argument("--base-url", default="http://localhost:3000", help="Conductor API base URL")
-    parser.add_argument("--poll-interval", type=int, default=5, help="Polling interval in seconds")
+    parser.add_argument("--poll-interval", type=int, default=5, help="Maximum backoff between idle polls in seconds")
+    parser.add_argument("--long-poll-timeout", type=int, default=25, help="How long the server may hold a poll open, in seconds")
 
     args = parser.parse_args()
 
@@ -270,7 +410,8 @@ def main():
         agent_id=args.agent_id,
         api_key=args.api_key,
         base_url=args.base_url,
-        poll_interval=args.poll_interval
+        poll_interval=args.poll_interval,
+        long_poll_timeout=args.long_poll_timeout
     )
 
     agent.run()
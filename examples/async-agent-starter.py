@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Conductor Agent - Python Async Starter
+
+An asyncio variant of agent-starter.py. All API calls go through a single
+aiohttp session, task log messages are posted in the background while the
+task keeps running, and heartbeats are sent from their own coroutine.
+
+Usage:
+    python async-agent-starter.py --agent-id YOUR_AGENT_ID --api-key YOUR_API_KEY
+
+Requirements:
+    pip install aiohttp anthropic openai
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Any, Optional
+import aiohttp
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class AsyncConductorAgent:
+    """Base class for asyncio Conductor agents"""
+
+    def __init__(
+        self,
+        agent_id: str,
+        api_key: str,
+        capabilities: list[str],
+        base_url: str = "http://localhost:3000",
+        poll_interval: int = 5,
+        long_poll_timeout: int = 25,
+        heartbeat_interval: int = 30
+    ):
+        self.agent_id = agent_id
+        self.api_key = api_key
+        self.capabilities = capabilities
+        self.base_url = base_url
+        self.poll_interval = poll_interval
+        self.long_poll_timeout = long_poll_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.running = True
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._hb_status = "active"
+        self._log_queue: Optional[asyncio.Queue] = None
+
+    async def poll_for_task(self) -> Optional[Dict[str, Any]]:
+        """Long-poll the API for an available task"""
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/tasks/poll",
+                json={
+                    "agent_id": self.agent_id,
+                    "capabilities": self.capabilities,
+                    "wait_ms": self.long_poll_timeout * 1000
+                },
+                timeout=aiohttp.ClientTimeout(total=self.long_poll_timeout + 5)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get("success") and data.get("data"):
+                        return data["data"].get("task")
+                return None
+
+        except Exception as e:
+            logger.error(f"Error polling for task: {e}")
+            return None
+
+    async def send_heartbeat(self, status: str = "active") -> bool:
+        """Send heartbeat to indicate agent is alive"""
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/agents/heartbeat",
+                json={
+                    "agent_id": self.agent_id,
+                    "status": status
+                }
+            ) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error(f"Error sending heartbeat: {e}")
+            return False
+
+    async def _post_log(self, task_id: str, message: str, level: str, data: Optional[Dict]):
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/tasks/{task_id}/logs",
+                json={
+                    "agent_id": self.agent_id,
+                    "level": level,
+                    "message": message,
+                    "data": data or {}
+                }
+            ):
+                pass
+        except Exception as e:
+            logger.error(f"Error logging task message: {e}")
+
+    def log_task_message(self, task_id: str, message: str, level: str = "info", data: Optional[Dict] = None):
+        """
+        Log a message for a task without waiting for the request to finish.
+
+        Can be called from the event loop or from execute_task, which runs in
+        a worker thread. Messages are sent one at a time, in the order they
+        were logged; flush_logs() waits until they have all been sent.
+        """
+        item = (task_id, message, level, data)
+        try:
+            asyncio.get_running_loop()
+            self._log_queue.put_nowait(item)
+        except RuntimeError:
+            self._loop.call_soon_threadsafe(self._log_queue.put_nowait, item)
+
+    async def _log_consumer(self):
+        """Post queued log messages in order"""
+        while True:
+            item = await self._log_queue.get()
+            try:
+                await self._post_log(*item)
+            finally:
+                self._log_queue.task_done()
+
+    async def flush_logs(self):
+        """Wait for all queued log messages to be sent"""
+        await self._log_queue.join()
+
+    async def complete_task(self, task_id: str, output_data: Dict[str, Any]) -> bool:
+        """Mark task as completed"""
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/tasks/{task_id}/complete",
+                json={
+                    "agent_id": self.agent_id,
+                    "output_data": output_data
+                }
+            ) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error(f"Error completing task: {e}")
+            return False
+
+    async def fail_task(self, task_id: str, error_message: str) -> bool:
+        """Mark task as failed"""
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/tasks/{task_id}/fail",
+                json={
+                    "agent_id": self.agent_id,
+                    "error_message": error_message
+                }
+            ) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error(f"Error failing task: {e}")
+            return False
+
+    def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the given task. Override this method in your agent implementation.
+
+        This runs in a worker thread, so it may block; log messages sent from
+        here are posted in the background on the event loop.
+
+        Args:
+            task: The task object containing title, description, input_data, etc.
+
+        Returns:
+            Dictionary containing the output data
+        """
+        raise NotImplementedError("Subclasses must implement execute_task()")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, capped at poll_interval"""
+        return random.uniform(0, min(self.poll_interval, 0.5 * 2 ** attempt))
+
+    async def _heartbeat_loop(self):
+        """Send heartbeats on a fixed wall clock until cancelled"""
+        while True:
+            await self.send_heartbeat(self._hb_status)
+            logger.debug("Sent heartbeat")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _handle_task(self, task: Dict[str, Any]):
+        task_id = task["id"]
+        logger.info(f"Received task: {task['title']}")
+
+        self.log_task_message(task_id, f"Task assigned to agent {self.agent_id}")
+
+        try:
+            self._hb_status = "busy"
+
+            # Execute the task off the event loop so logs flush concurrently
+            self.log_task_message(task_id, "Starting task execution")
+            output_data = await self._loop.run_in_executor(None, self.execute_task, task)
+
+            # Complete the task
+            self.log_task_message(task_id, "Task completed successfully")
+            await self.flush_logs()
+            await self.complete_task(task_id, output_data)
+            logger.info(f"Task {task_id} completed successfully")
+
+        except Exception as e:
+            logger.error(f"Task execution failed: {e}")
+            self.log_task_message(task_id, f"Task execution failed: {str(e)}", level="error")
+            await self.flush_logs()
+            await self.fail_task(task_id, str(e))
+
+        finally:
+            self._hb_status = "active"
+
+    async def run(self):
+        """Main agent loop"""
+        logger.info(f"Agent {self.agent_id} starting...")
+        logger.info(f"Capabilities: {', '.join(self.capabilities)}")
+
+        self._loop = asyncio.get_running_loop()
+        connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        self._log_queue = asyncio.Queue()
+        log_consumer = asyncio.create_task(self._log_consumer())
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+        idle_polls = 0
+
+        try:
+            while self.running:
+                try:
+                    task = await self.poll_for_task()
+
+                    if task:
+                        idle_polls = 0
+                        await self._handle_task(task)
+                    else:
+                        # Back off only when idle; after a task, poll again immediately
+                        logger.debug("No tasks available")
+                        await asyncio.sleep(self._backoff_delay(idle_polls))
+                        idle_polls += 1
+
+                except Exception as e:
+                    logger.error(f"Error in agent loop: {e}")
+                    await asyncio.sleep(self._backoff_delay(idle_polls))
+                    idle_polls += 1
+
+        except asyncio.CancelledError:
+            logger.info("Shutting down agent...")
+            self.running = False
+
+        finally:
+            heartbeat.cancel()
+            await self.flush_logs()
+            log_consumer.cancel()
+            await self.send_heartbeat("offline")
+            await self.session.close()
+
+
+class ExampleAgent(AsyncConductorAgent):
+    """Example agent implementation"""
+
+    def __init__(self, agent_id: str, api_key: str, **kwargs):
+        super().__init__(
+            agent_id=agent_id,
+            api_key=api_key,
+            capabilities=["coding", "analysis", "documentation"],
+            **kwargs
+        )
+        # Initialize your AI client here (Anthropic, OpenAI, etc.)
+        # self.ai_client = anthropic.Anthropic(api_key=api_key)
+
+    def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a task using AI"""
+        task_id = task["id"]
+        title = task["title"]
+        task_type = task.get("type", "feature")
+
+        logger.info(f"Executing {task_type} task: {title}")
+
+        # Log progress; these return immediately
+        self.log_task_message(task_id, "Analyzing task requirements")
+
+        # Simulate work
+        time.sleep(2)
+        self.log_task_message(task_id, "Processing task with AI model")
+        time.sleep(2)
+        self.log_task_message(task_id, "Generating output")
+        time.sleep(1)
+
+        # Return output data
+        return {
+            "result": f"Completed {task_type} task: {title}",
+            "task_type": task_type,
+            "execution_time": "5 seconds",
+            "model": "example-model",
+            "success": True
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an async Conductor agent")
+    parser.add_argument("--agent-id", required=True, help="Agent ID from Conductor")
+    parser.add_argument("--api-key", required=True, help="AI API key (Anthropic/OpenAI)")
+    parser.add_argument("--base-url", default="http://localhost:3000", help="Conductor API base URL")
+    parser.add_argument("--poll-interval", type=int, default=5, help="Maximum backoff between idle polls in seconds")
+    parser.add_argument("--long-poll-timeout", type=int, default=25, help="How long the server may hold a poll open, in seconds")
+
+    args = parser.parse_args()
+
+    # Create and run agent
+    agent = ExampleAgent(
+        agent_id=args.agent_id,
+        api_key=args.api_key,
+        base_url=args.base_url,
+        poll_interval=args.poll_interval,
+        long_poll_timeout=args.long_poll_timeout
+    )
+
+    try:
+        asyncio.run(agent.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
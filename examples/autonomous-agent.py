@@ -11,16 +11,168 @@ This agent can actually execute coding tasks by:
 6. Committing changes to git
 
 Requirements:
-    pip install requests anthropic gitpython
+    pip install "httpx[http2]" anthropic gitpython
+
+Optional:
+    pip install pygit2    # commit in-process instead of spawning git
 """
 
 import os
-import json
+import hashlib
+import stat
+import string
 import subprocess
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from graphlib import TopologicalSorter
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import anthropic
-from agent_starter import ConductorAgent
+from agent_starter import ConductorAgent, json_dumps, json_loads
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Independent plan steps run concurrently, capped to stay within API rate limits
+MAX_PARALLEL_STEPS = 4
+
+# Response token limits for plans and for generated files
+MAX_PLAN_TOKENS = 4000
+MAX_FILE_TOKENS = 8000
+
+# Files are modified by having the model return them whole, so the original must
+# fit in a single response. Source code runs about 3 bytes per token, and a
+# quarter of the response is left for the file to grow.
+MAX_MODIFY_BYTES = MAX_FILE_TOKENS * 3 * 3 // 4
+
+# Plans are cached on disk by task signature so retries skip the planning call.
+# Kept outside the workspace so the cache is never committed with the changes.
+PLAN_CACHE_DIR = Path.home() / ".cache" / "conductor" / "plans"
+PLAN_CACHE_TTL = 24 * 60 * 60
+
+# Prompt templates for generated files
+_CREATE_PROMPT = string.Template("""
+You are an expert software engineer writing code.
+
+Task: Create a new file at ${file_path}
+Purpose: ${description}
+
+Existing codebase context:
+Technologies: ${tech}
+
+Related files:
+${rendered_files}
+
+Generate the COMPLETE contents of this file. Include:
+- All necessary imports
+- Proper type hints/types
+- Error handling
+- Comments explaining complex logic
+- Following the existing code style
+
+Return ONLY the file contents, no explanations or markdown.
+""")
+
+_MODIFY_PROMPT = string.Template("""
+You are an expert software engineer modifying existing code.
+
+Task: Modify ${file_path}
+Purpose: ${description}
+
+Current file contents:
+${original_content}
+
+Related context:
+${rendered_files}
+
+Modify this file to accomplish the task. Return the COMPLETE modified file contents.
+Preserve existing functionality and code style. Return ONLY the code, no explanations.
+""")
+
+# Read once at import (umask can only be read by setting it) so new files
+# written through temp files get the same mode a plain open() would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class _ResponseCutOff(ValueError):
+    """An AI response stopped at max_tokens before it was complete"""
+
+
+class _FenceStripper:
+    """
+    Incrementally strip markdown from a streamed AI response.
+
+    Text before the first code fence is written provisionally and discarded
+    if a fence opens; the body of the first fenced block is kept verbatim and
+    anything after its closing fence is dropped. Unfenced responses are
+    written with surrounding whitespace stripped.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.size = 0
+        self.state = "preamble"
+        self._partial = ""
+        self._held = ""
+        self._first_line = True
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def feed(self, chunk: str):
+        self._partial += chunk
+        *lines, self._partial = self._partial.split("\n")
+        for line in lines:
+            self._line(line)
+
+    def finish(self):
+        if self._partial:
+            self._line(self._partial)
+            self._partial = ""
+
+    def _line(self, line: str):
+        if self.state == "done":
+            return
+
+        # A fence opens at any indentation, but only closes at column 0 so
+        # indented ``` inside the code (docstrings, nested markdown) is kept
+        if self.state == "preamble" and line.lstrip().startswith("```"):
+            self.out.seek(0)
+            self.out.truncate()
+            self.size = 0
+            self._held = ""
+            self._first_line = True
+            self.state = "code"
+            return
+
+        if self.state == "code" and line.startswith("```"):
+            self.state = "done"
+            return
+
+        text = line if self._first_line else "\n" + line
+        self._first_line = False
+
+        if self.state == "code":
+            self._write(text)
+            return
+
+        # Hold trailing whitespace back until more content follows
+        core = text.rstrip()
+        if core.strip():
+            self._write(core.lstrip() if self.size == 0 else self._held + core)
+            self._held = text[len(core):]
+        else:
+            self._held += text
+
+    def _write(self, text: str):
+        self.out.write(text)
+        self.size += len(text)
+
 
 class AutonomousCodingAgent(ConductorAgent):
     """
@@ -44,6 +196,21 @@ class AutonomousCodingAgent(ConductorAgent):
         self.workspace = Path(workspace_path).resolve()
         self.model = "claude-sonnet-4"
 
+        # Directories known to exist, so creating files doesn't re-stat ancestors
+        self._known_dirs: set[Path] = set()
+
+        # package.json dependencies, reused until the file changes
+        self._pkg_cache_key = None
+        self._pkg_cache: List[str] = []
+
+        # Commit through libgit2 when available; otherwise shell out to git
+        self._repo = None
+        if pygit2 is not None:
+            try:
+                self._repo = pygit2.Repository(str(self.workspace))
+            except pygit2.GitError:
+                pass
+
     def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
         Autonomously execute a coding task
@@ -56,6 +223,9 @@ class AutonomousCodingAgent(ConductorAgent):
 
         self.log_task_message(task_id, f"🤖 Starting autonomous execution of {task_type}: {title}")
 
+        # The workspace may have changed since the last task
+        self._known_dirs.clear()
+
         try:
             # Step 1: Analyze the task and create a plan
             self.log_task_message(task_id, "📋 Analyzing task requirements...")
@@ -67,12 +237,18 @@ class AutonomousCodingAgent(ConductorAgent):
             context = self._gather_codebase_context(plan)
             self.log_task_message(task_id, f"Analyzed {len(context['files'])} relevant files")
 
-            # Step 3: Execute each step of the plan
-            results = []
-            for i, step in enumerate(plan['steps'], 1):
-                self.log_task_message(task_id, f"⚙️ Step {i}/{len(plan['steps'])}: {step['action']}")
-                step_result = self._execute_step(task_id, step, context)
-                results.append(step_result)
+            # Render the prompt context once instead of once per step
+            context["_rendered_files"] = json_dumps(
+                {k: v[:500] for k, v in context["files"].items()}, indent=True
+            ).decode()
+            context["_tech_str"] = ", ".join(context["technologies"])
+            context["_written_files"] = []
+
+            # Step 3: Execute the plan, running independent steps in parallel
+            results = self._execute_steps(task_id, plan['steps'], context)
+
+            # Make the plan's file renames durable, one fsync per directory
+            self._sync_files(context["_written_files"])
 
             # Step 4: Validate the changes
             self.log_task_message(task_id, "✅ Validating changes...")
@@ -100,6 +276,10 @@ class AutonomousCodingAgent(ConductorAgent):
 
         except Exception as e:
             self.log_task_message(task_id, f"❌ Error during execution: {str(e)}", level="error")
+            # Only a malformed step means the cached plan itself is bad. Other
+            # failures are usually transient, so a retry keeps the plan.
+            if isinstance(e, (KeyError, TypeError, AttributeError)):
+                self._evict_cached_plan(self._plan_cache_key(title, description, task_type, input_data))
             raise
 
     def _create_execution_plan(
@@ -112,13 +292,19 @@ class AutonomousCodingAgent(ConductorAgent):
         """
         Use AI to create a step-by-step execution plan
         """
+        cache_key = self._plan_cache_key(title, description, task_type, input_data)
+        cached_plan = self._load_cached_plan(cache_key)
+        if cached_plan is not None:
+            return cached_plan
+
+        rendered_input = json_dumps(input_data, indent=True).decode()
         prompt = f"""
 You are an expert software engineer creating an execution plan for a coding task.
 
 Task Type: {task_type}
 Title: {title}
 Description: {description}
-Input Data: {json.dumps(input_data, indent=2)}
+Input Data: {rendered_input}
 
 Create a detailed execution plan with specific steps. Each step should include:
 1. action: What to do (e.g., "create_file", "modify_file", "run_command")
@@ -141,12 +327,17 @@ Return your plan as JSON with this structure:
 }}
 """
 
+        # Deterministic output so identical tasks produce cacheable plans
         response = self.ai_client.messages.create(
             model=self.model,
-            max_tokens=4000,
+            max_tokens=MAX_PLAN_TOKENS,
+            temperature=0,
             messages=[{"role": "user", "content": prompt}]
         )
 
+        if response.stop_reason == "max_tokens":
+            raise ValueError("Execution plan was cut off by the token limit")
+
         plan_text = response.content[0].text
         # Extract JSON from response (handle markdown code blocks)
         if "```json" in plan_text:
@@ -154,7 +345,92 @@ Return your plan as JSON with this structure:
         elif "```" in plan_text:
             plan_text = plan_text.split("```")[1].split("```")[0].strip()
 
-        return json.loads(plan_text)
+        plan = json_loads(plan_text)
+        if not self._is_valid_plan(plan):
+            raise ValueError("Execution plan has no steps list")
+
+        self._store_cached_plan(cache_key, plan)
+        return plan
+
+    def _plan_cache_key(self, title: str, description: str, task_type: str, input_data: Dict) -> str:
+        """
+        Hash the task signature that determines the plan
+        """
+        return hashlib.sha256(json_dumps(
+            [self.model, title, description, task_type, input_data],
+            sort_keys=True
+        )).hexdigest()
+
+    @staticmethod
+    def _is_valid_plan(plan: Any) -> bool:
+        """
+        Check the plan has the shape execute_task relies on
+        """
+        return isinstance(plan, dict) and isinstance(plan.get("steps"), list)
+
+    def _load_cached_plan(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached plan for this task signature if it has not expired
+        """
+        cache_file = PLAN_CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime > PLAN_CACHE_TTL:
+                return None
+            plan = json_loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return plan if self._is_valid_plan(plan) else None
+
+    def _evict_cached_plan(self, key: str):
+        """
+        Forget a cached plan so the next attempt asks the model again
+        """
+        try:
+            (PLAN_CACHE_DIR / f"{key}.json").unlink()
+        except OSError:
+            pass
+
+    def _store_cached_plan(self, key: str, plan: Dict[str, Any]):
+        """
+        Cache a plan, replacing the file atomically so concurrent agents never read a partial plan
+        """
+        try:
+            PLAN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=PLAN_CACHE_DIR, suffix=".tmp")
+        except OSError:
+            return
+
+        # Caching is best effort; never let it fail the task
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_dumps(plan))
+            os.replace(tmp_path, PLAN_CACHE_DIR / f"{key}.json")
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _get_technologies(self) -> List[str]:
+        """
+        Return the workspace's package.json dependencies, re-parsing only when the file changes
+        """
+        package_json = self.workspace / "package.json"
+        try:
+            st = os.stat(package_json)
+        except OSError:
+            return []
+
+        key = (st.st_mtime_ns, st.st_size)
+        if key != self._pkg_cache_key:
+            try:
+                pkg = json_loads(package_json.read_bytes())
+                self._pkg_cache = list(pkg.get("dependencies", {}).keys())
+            except (OSError, ValueError, AttributeError):
+                self._pkg_cache = []
+            self._pkg_cache_key = key
+
+        return self._pkg_cache
 
     def _gather_codebase_context(self, plan: Dict) -> Dict[str, Any]:
         """
@@ -167,29 +443,83 @@ Return your plan as JSON with this structure:
         }
 
         # Get project structure
-        try:
-            package_json = self.workspace / "package.json"
-            if package_json.exists():
-                with open(package_json) as f:
-                    pkg = json.load(f)
-                    context["technologies"] = list(pkg.get("dependencies", {}).keys())
-        except:
-            pass
+        context["technologies"] = self._get_technologies()
 
-        # Read relevant files based on plan
-        for step in plan.get("steps", []):
-            target = step.get("target", "")
-            if target:
-                file_path = self.workspace / target
-                if file_path.exists():
-                    try:
-                        with open(file_path) as f:
-                            context["files"][target] = f.read()
-                    except:
-                        pass
+        # Read relevant files based on plan, overlapping the reads
+        targets = list(dict.fromkeys(s.get("target") for s in plan.get("steps", []) if s.get("target")))
+
+        def _read(target):
+            # Let open() report missing files rather than stat-ing first
+            try:
+                return (target, (self.workspace / target).read_text())
+            except (OSError, UnicodeDecodeError):
+                return None
+
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(16, len(targets))) as executor:
+                for result in executor.map(_read, targets):
+                    if result:
+                        context["files"][result[0]] = result[1]
 
         return context
 
+    def _step_graph(self, steps: List[Dict]) -> Dict[int, set]:
+        """
+        Map each step index to the indices of the steps it must wait for
+
+        A step waits for the latest earlier step targeting any of its
+        dependencies, and for earlier steps on its own target. Commands may
+        touch anything, so they wait for everything before them and every
+        later step waits for them.
+        """
+        graph = {}
+        last_step_for = {}
+        barrier = -1
+
+        for i, step in enumerate(steps):
+            deps = {last_step_for[d] for d in step.get("dependencies") or [] if isinstance(d, str) and d in last_step_for}
+            target = step.get("target")
+            if target in last_step_for:
+                deps.add(last_step_for[target])
+            if step.get("action") == "run_command":
+                deps.update(range(barrier + 1, i))
+                barrier = i
+            elif barrier >= 0:
+                deps.add(barrier)
+
+            graph[i] = deps
+            if target:
+                last_step_for[target] = i
+
+        return graph
+
+    def _execute_steps(
+        self,
+        task_id: str,
+        steps: List[Dict],
+        context: Dict
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute plan steps, running steps whose dependencies are done concurrently
+        """
+        sorter = TopologicalSorter(self._step_graph(steps))
+        sorter.prepare()
+
+        results = []
+        pending = {}
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_STEPS) as executor:
+            while sorter.is_active():
+                for i in sorter.get_ready():
+                    self.log_task_message(task_id, f"⚙️ Step {i + 1}/{len(steps)}: {steps[i]['action']}")
+                    pending[executor.submit(self._execute_step, task_id, steps[i], context)] = i
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.append(future.result())
+                    sorter.done(pending.pop(future))
+
+        return results
+
     def _execute_step(
         self,
         task_id: str,
@@ -208,10 +538,92 @@ Return your plan as JSON with this structure:
         elif action == "modify_file":
             return self._modify_file(task_id, target, description, context)
         elif action == "run_command":
-            return self._run_command(task_id, target, description)
+            try:
+                return self._run_command(task_id, target, description)
+            finally:
+                # The command may have changed any file or directory we
+                # cached, so later steps read them from disk again
+                context["files"].clear()
+                self._known_dirs.clear()
         else:
             return {"action": action, "status": "skipped"}
 
+    def _stream_to_file(self, prompt: str, full_path: Path) -> int:
+        """
+        Stream an AI response into full_path, stripping markdown as it arrives
+
+        The response is written to a temp file next to full_path, which
+        replaces it only once the response is complete, so a crash or a
+        response cut off by max_tokens never leaves a half-written file. The
+        data is fsynced before the rename; making the rename itself durable
+        is left to _sync_files. Returns the number of characters written.
+        """
+        if full_path.exists():
+            mode = stat.S_IMODE(full_path.stat().st_mode)
+        else:
+            mode = 0o666 & ~_UMASK
+
+        fd, tmp_path = tempfile.mkstemp(dir=full_path.parent, prefix=f".{full_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                stripper = _FenceStripper(f)
+                with self.ai_client.messages.stream(
+                    model=self.model,
+                    max_tokens=MAX_FILE_TOKENS,
+                    messages=[{"role": "user", "content": prompt}]
+                ) as stream:
+                    for text in stream.text_stream:
+                        stripper.feed(text)
+                        # Stop receiving once the code block has closed
+                        if stripper.done:
+                            break
+                    else:
+                        if stream.get_final_message().stop_reason == "max_tokens":
+                            raise _ResponseCutOff(f"Response for {full_path.name} was cut off by the token limit")
+                stripper.finish()
+                # Data must reach disk before the rename, or a power loss
+                # could leave the new name pointing at an empty file
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        return stripper.size
+
+    def _sync_files(self, paths: List[Path]):
+        """
+        Make the renames of written files durable before they are committed
+
+        File data is already fsynced by _stream_to_file; this fsyncs each
+        parent directory once, however many files were written into it.
+        """
+        for directory in {path.parent for path in paths}:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                # Directories can't be opened for fsync on some platforms (Windows)
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _ensure_dir(self, path: Path):
+        """
+        Create path and its parents unless we already know they exist
+        """
+        if path in self._known_dirs:
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        self._known_dirs.update(path.parents)
+        self._known_dirs.add(path)
+
     def _create_file(
         self,
         task_id: str,
@@ -222,62 +634,26 @@ Return your plan as JSON with this structure:
         """
         Use AI to generate and write a new file
         """
-        prompt = f"""
-You are an expert software engineer writing code.
-
-Task: Create a new file at {file_path}
-Purpose: {description}
-
-Existing codebase context:
-Technologies: {', '.join(context.get('technologies', []))}
-
-Related files:
-{json.dumps({k: v[:500] for k, v in context.get('files', {}).items()}, indent=2)}
-
-Generate the COMPLETE contents of this file. Include:
-- All necessary imports
-- Proper type hints/types
-- Error handling
-- Comments explaining complex logic
-- Following the existing code style
-
-Return ONLY the file contents, no explanations or markdown.
-"""
-
-        response = self.ai_client.messages.create(
-            model=self.model,
-            max_tokens=8000,
-            messages=[{"role": "user", "content": prompt}]
+        prompt = _CREATE_PROMPT.substitute(
+            file_path=file_path,
+            description=description,
+            tech=context["_tech_str"],
+            rendered_files=context["_rendered_files"]
         )
 
-        file_contents = response.content[0].text
-
-        # Remove markdown code blocks if present
-        if "```" in file_contents:
-            lines = file_contents.split("\n")
-            code_lines = []
-            in_code = False
-            for line in lines:
-                if line.strip().startswith("```"):
-                    in_code = not in_code
-                    continue
-                if in_code or not any(line.startswith(x) for x in ["```", "#", "Here", "This"]):
-                    code_lines.append(line)
-            file_contents = "\n".join(code_lines).strip()
-
-        # Write the file
+        # Stream the file straight to disk
         full_path = self.workspace / file_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(full_path, 'w') as f:
-            f.write(file_contents)
+        self._ensure_dir(full_path.parent)
+        size = self._stream_to_file(prompt, full_path)
+        context["files"].pop(file_path, None)
+        context["_written_files"].append(full_path)
 
-        self.log_task_message(task_id, f"✍️ Created {file_path} ({len(file_contents)} chars)")
+        self.log_task_message(task_id, f"✍️ Created {file_path} ({size} chars)")
 
         return {
             "action": "create_file",
             "file": file_path,
-            "size": len(file_contents),
+            "size": size,
             "status": "success"
         }
 
@@ -293,52 +669,49 @@ Return ONLY the file contents, no explanations or markdown.
         """
         full_path = self.workspace / file_path
 
-        if not full_path.exists():
-            return {"action": "modify_file", "status": "file_not_found"}
-
-        with open(full_path) as f:
-            original_content = f.read()
-
-        prompt = f"""
-You are an expert software engineer modifying existing code.
-
-Task: Modify {file_path}
-Purpose: {description}
-
-Current file contents:
-{original_content}
+        # Reuse the content read while gathering context when we have it
+        original_content = context["files"].get(file_path)
+        if original_content is not None:
+            file_size = len(original_content.encode())
+        else:
+            try:
+                file_size = full_path.stat().st_size
+            except OSError:
+                return {"action": "modify_file", "status": "file_not_found"}
 
-Related context:
-{json.dumps({k: v[:500] for k, v in context.get('files', {}).items()}, indent=2)}
+        # Check the size before reading so huge files never reach the prompt
+        if file_size > MAX_MODIFY_BYTES:
+            self.log_task_message(
+                task_id,
+                f"⚠️ Skipped {file_path}: {file_size} bytes is too large to rewrite",
+                level="warning"
+            )
+            return {"action": "modify_file", "size": file_size, "status": "file_too_large"}
 
-Modify this file to accomplish the task. Return the COMPLETE modified file contents.
-Preserve existing functionality and code style. Return ONLY the code, no explanations.
-"""
+        if original_content is None:
+            original_content = full_path.read_text()
 
-        response = self.ai_client.messages.create(
-            model=self.model,
-            max_tokens=8000,
-            messages=[{"role": "user", "content": prompt}]
+        prompt = _MODIFY_PROMPT.substitute(
+            file_path=file_path,
+            description=description,
+            original_content=original_content,
+            rendered_files=context["_rendered_files"]
         )
 
-        modified_content = response.content[0].text
-
-        # Clean up markdown if present
-        if "```" in modified_content:
-            lines = modified_content.split("\n")
-            code_lines = []
-            in_code = False
-            for line in lines:
-                if line.strip().startswith("```"):
-                    in_code = not in_code
-                    continue
-                if in_code:
-                    code_lines.append(line)
-            modified_content = "\n".join(code_lines).strip()
-
-        # Write the modified file
-        with open(full_path, 'w') as f:
-            f.write(modified_content)
+        # Stream the modified file over the original. The cached copy is now
+        # stale, so later steps on this file read it back from disk.
+        try:
+            new_size = self._stream_to_file(prompt, full_path)
+        except _ResponseCutOff:
+            # The size check is an estimate; a cut-off rewrite leaves the original untouched
+            self.log_task_message(
+                task_id,
+                f"⚠️ Skipped {file_path}: the rewrite did not fit in one response",
+                level="warning"
+            )
+            return {"action": "modify_file", "size": file_size, "status": "file_too_large"}
+        context["files"].pop(file_path, None)
+        context["_written_files"].append(full_path)
 
         self.log_task_message(task_id, f"✏️ Modified {file_path}")
 
@@ -346,7 +719,7 @@ Preserve existing functionality and code style. Return ONLY the code, no explana
             "action": "modify_file",
             "file": file_path,
             "original_size": len(original_content),
-            "new_size": len(modified_content),
+            "new_size": new_size,
             "status": "success"
         }
 
@@ -403,7 +776,7 @@ Preserve existing functionality and code style. Return ONLY the code, no explana
                 ["git", "status", "--porcelain"],
                 cwd=self.workspace,
                 capture_output=True,
-                text=True
+                encoding="utf-8"
             )
             if not result.stdout.strip():
                 issues.append("No changes detected")
@@ -414,11 +787,15 @@ Preserve existing functionality and code style. Return ONLY the code, no explana
         try:
             # Check for TypeScript errors
             if (self.workspace / "tsconfig.json").exists():
+                # Only the exit code and a snippet of stderr are used, so
+                # don't buffer the (potentially large) stdout
                 result = subprocess.run(
                     ["npm", "run", "type-check"],
                     cwd=self.workspace,
-                    capture_output=True,
-                    text=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    encoding="utf-8",
+                    errors="replace",
                     timeout=30
                 )
                 if result.returncode != 0:
@@ -435,6 +812,12 @@ Preserve existing functionality and code style. Return ONLY the code, no explana
         """
         Commit changes to git
         """
+        if self._repo is not None:
+            try:
+                return self._commit_changes_in_process(message)
+            except Exception as e:
+                return f"commit_failed: {str(e)}"
+
         try:
             # Add all changes
             subprocess.run(
@@ -463,12 +846,28 @@ Preserve existing functionality and code style. Return ONLY the code, no explana
         except Exception as e:
             return f"commit_failed: {str(e)}"
 
+    def _commit_changes_in_process(self, message: str) -> str:
+        """
+        Stage everything and commit through pygit2, without spawning git
+        """
+        repo = self._repo
+        index = repo.index
+        index.add_all()
+        index.write()
+        tree = index.write_tree()
+
+        signature = repo.default_signature
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        oid = repo.create_commit("HEAD", signature, signature, f"🤖 {message}", tree, parents)
+
+        return str(oid)[:8]
+
     def _generate_summary(self, results: List[Dict]) -> str:
         """
         Generate a human-readable summary of what was done
         """
         files_created = [r['file'] for r in results if r.get('action') == 'create_file']
-        files_modified = [r['file'] for r in results if r.get('action') == 'modify_file']
+        files_modified = [r['file'] for r in results if r.get('action') == 'modify_file' and 'file' in r]
         commands_run = [r['command'] for r in results if r.get('action') == 'run_command']
 
         summary_parts = []
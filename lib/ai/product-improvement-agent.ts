@@ -19,6 +19,7 @@ export async function analyzeTaskCompletion(task: Task): Promise<AnalysisHistory
       .select('*')
       .eq('task_id', task.id)
       .order('created_at', { ascending: true })
+      .order('seq', { ascending: true })
 
     const systemPrompt = `You are a Product Improvement Agent analyzing completed software development tasks.
 Your role is to:
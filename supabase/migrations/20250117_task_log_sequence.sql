@@ -0,0 +1,10 @@
+-- ============================================================================
+-- Task Log Ordering
+-- Rows inserted by one statement share the same NOW(), so a batch of logs
+-- cannot be ordered by created_at alone. seq increases with every inserted
+-- row and breaks those ties; both timestamps and order come from the database.
+-- ============================================================================
+
+ALTER TABLE task_logs ADD COLUMN seq BIGSERIAL;
+
+CREATE INDEX idx_task_logs_task_order ON task_logs(task_id, created_at, seq);
@@ -71,6 +71,7 @@ export interface TaskLog {
   message: string
   data: Record<string, unknown>
   created_at: string
+  seq: number
 }
 
 export type LogLevel = 'info' | 'warning' | 'error' | 'debug'
@@ -219,6 +220,7 @@ export interface UpdateTaskRequest {
 export interface PollTaskRequest {
   agent_id: string
   capabilities: string[]
+  wait_ms?: number
 }
 
 export interface PollTaskResponse {
@@ -243,6 +245,11 @@ export interface CreateTaskLogRequest {
   data?: Record<string, unknown>
 }
 
+export interface CreateTaskLogBatchRequest {
+  agent_id?: string
+  entries: Omit<CreateTaskLogRequest, 'task_id'>[]
+}
+
 export interface CreateAnalysisRequest {
   analyzer_agent_id?: string
   task_id?: string
@@ -924,7 +931,7 @@ export interface Database {
       }
       task_logs: {
         Row: TaskLog
-        Insert: Omit<TaskLog, 'id' | 'created_at'>
+        Insert: Omit<TaskLog, 'id' | 'created_at' | 'seq'>
         Update: never
       }
       analysis_history: {